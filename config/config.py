@@ -1,38 +1,222 @@
 # presence_ai/config/config.py
 import os
 import json
+import dataclasses
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config.json')
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Built-in settings, used for any key config.json leaves out (or if it is missing).
+# The emotion schema is not among them: it lives only in config.json.
+_DEFAULTS = {
+    "default_mode": "scratch",
+    "vault_key_path": "config/vault.key",
+    "vault_path": "vault_data/virem_vault.bin",
+    "emotion_log_file": "logs/ere_weight_log.jsonl",
+    "introspection_log_file": "logs/consciousness_log.jsonl",
+    "emotion_reactor_file": "virem_vault/emotion_reactor.json",
+    "decay_rate": 0.05,
+    "fallback_emotion": "neutral",
+}
+
+# Used only when config.json itself is missing, so the defaults still form a valid schema.
+_FALLBACK_EMOTIONS = {"neutral": {"initial_weight": 1.0}}
+
+MODES = ("scratch", "persistent")
+
+# Fields a session may override on its own snapshot; everything else is shared.
+_OVERRIDABLE = frozenset({"default_mode", "decay_rate", "initial_weights"})
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigSnapshot:
+    """
+    Immutable, validated view of the configuration plus structures derived from it.
+
+    Components keep a reference to one snapshot for their whole lifetime, so a
+    session is configured by a pointer copy. Mappings are read-only proxies;
+    per-session changes go through with_overrides(), which shares every field
+    it does not replace.
+    """
+    default_mode: str
+    vault_key_path: str
+    vault_path: str
+    emotion_log_file: str
+    introspection_log_file: str
+    decay_rate: float
+    fallback_emotion: str
+    emotions: Tuple[str, ...]
+    emotion_index: Mapping[str, int]
+    initial_weights: Mapping[str, float]
+    lexicon: Tuple[Tuple[str, Tuple[str, ...]], ...] # (emotion, keywords) in detection order
+    persona_tones: Mapping[str, str]
+    reaction_table: Mapping[str, Mapping[str, str]]
+
+    def __post_init__(self):
+        if not _is_number(self.decay_rate):
+            raise ValueError(f"decay_rate must be a number, got {self.decay_rate!r}.")
+        if any(not _is_number(weight) for weight in self.initial_weights.values()):
+            raise ValueError("initial_weights values must be numbers.")
+        if self.default_mode not in MODES:
+            raise ValueError(f"default_mode must be one of {MODES}, got {self.default_mode!r}.")
+        if not 0.0 <= self.decay_rate <= 1.0:
+            raise ValueError(f"decay_rate must be within [0, 1], got {self.decay_rate}.")
+        if not self.emotions:
+            raise ValueError("The emotion schema must define at least one emotion.")
+        if self.fallback_emotion not in self.emotion_index:
+            raise ValueError(f"fallback_emotion {self.fallback_emotion!r} is not in the emotion schema.")
+        if set(self.initial_weights) != set(self.emotions):
+            raise ValueError("initial_weights must define exactly the emotions in the schema.")
+        for emotion, weight in self.initial_weights.items():
+            if not 0.0 <= weight <= 1.0:
+                raise ValueError(f"Initial weight for {emotion!r} must be within [0, 1], got {weight}.")
+
+    def with_overrides(self, **overrides) -> "ConfigSnapshot":
+        """
+        Returns a validated copy with the given fields replaced (copy-on-write).
+        initial_weights overrides are merged into the shared weights per emotion.
+        """
+        unknown = set(overrides) - _OVERRIDABLE
+        if unknown:
+            raise ValueError(f"Cannot override {sorted(unknown)}; overridable fields: {sorted(_OVERRIDABLE)}.")
+        if "initial_weights" in overrides:
+            merged = dict(self.initial_weights)
+            merged.update(overrides["initial_weights"])
+            overrides["initial_weights"] = MappingProxyType(merged)
+        return dataclasses.replace(self, **overrides)
+
+
+def _resolve(path: str) -> str:
+    """Resolves a config path relative to the project root."""
+    return os.path.join(PROJECT_ROOT, path)
+
+
+def _build_reaction_table(reactor_path: str, emotions: dict) -> Mapping[str, Mapping[str, str]]:
+    """
+    Precomputes emotion reactions (emoji, conceptual sound/haptic) from emotion_reactor.json.
+    Emotions the file does not cover fall back to the emoji in the emotion schema.
+    """
+    reaction_table = {}
+    try:
+        with open(reactor_path, 'r') as f:
+            data = json.load(f)
+        for emotion, rules in data.get("emotion_rules", {}).items():
+            emojis = rules.get("emojis", [])
+            # Take the first emoji as the primary visual reaction
+            reaction_table[emotion] = MappingProxyType({
+                "visual": emojis[0] if emojis else "",
+                "sound": f"sound_{emotion}.wav",      # Conceptual sound file path
+                "haptic": f"haptic_pattern_{emotion}" # Conceptual haptic pattern ID
+            })
+    except FileNotFoundError:
+        print(f"Error: {reactor_path} not found. Using default internal reactions.")
+    except json.JSONDecodeError:
+        print(f"Error: Could not decode JSON from {reactor_path}. Using default internal reactions.")
+
+    for emotion, schema in emotions.items():
+        if emotion not in reaction_table:
+            reaction_table[emotion] = MappingProxyType({"visual": schema.get("emoji", ""), "sound": "", "haptic": ""})
+    return MappingProxyType(reaction_table)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_settings(settings: dict):
+    """
+    Checks the shape and types of raw settings so bad input surfaces as
+    ValueError instead of an AttributeError/TypeError while building the snapshot.
+    """
+    for key in ("default_mode", "vault_key_path", "vault_path", "emotion_log_file",
+                "introspection_log_file", "emotion_reactor_file", "fallback_emotion"):
+        if not isinstance(settings[key], str):
+            raise ValueError(f"{key} must be a string, got {type(settings[key]).__name__}.")
+    if not _is_number(settings["decay_rate"]):
+        raise ValueError(f"decay_rate must be a number, got {type(settings['decay_rate']).__name__}.")
+
+    emotions = settings["emotions"]
+    if not isinstance(emotions, dict) or not emotions:
+        raise ValueError("emotions must be a non-empty object mapping emotion names to their schema.")
+    for emotion, schema in emotions.items():
+        if not isinstance(schema, dict):
+            raise ValueError(f"Schema for emotion {emotion!r} must be an object.")
+        if "initial_weight" in schema and not _is_number(schema["initial_weight"]):
+            raise ValueError(f"initial_weight for {emotion!r} must be a number.")
+        keywords = schema.get("keywords", [])
+        if not isinstance(keywords, list) or not all(isinstance(word, str) for word in keywords):
+            raise ValueError(f"keywords for {emotion!r} must be a list of strings.")
+        for key in ("tone", "emoji"):
+            if key in schema and not isinstance(schema[key], str):
+                raise ValueError(f"{key} for {emotion!r} must be a string.")
+
+
+def load_config(config_path: str = CONFIG_PATH) -> ConfigSnapshot:
+    """
+    Reads config.json, validates it and builds a ConfigSnapshot.
+    Raises ValueError for malformed or invalid settings, unknown keys, or a
+    config.json without an emotion schema.
+    """
+    settings = dict(_DEFAULTS)
+    try:
+        with open(config_path, 'r') as f:
+            json_config = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: config.json not found at {config_path}. Using default settings and a neutral-only emotion schema.")
+        json_config = {"emotions": _FALLBACK_EMOTIONS}
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Could not decode JSON from {config_path}: {e}") from e
+    if not isinstance(json_config, dict):
+        raise ValueError(f"{config_path} must contain a JSON object.")
+    unknown = set(json_config) - set(_DEFAULTS) - {"emotions"}
+    if unknown:
+        raise ValueError(f"Unknown settings in {config_path}: {sorted(unknown)}.")
+    if "emotions" not in json_config:
+        raise ValueError(f"{config_path} must define the emotion schema under \"emotions\".")
+    settings.update(json_config)
+
+    _check_settings(settings)
+    emotions = settings["emotions"]
+    snapshot = ConfigSnapshot(
+        default_mode=settings["default_mode"],
+        vault_key_path=_resolve(settings["vault_key_path"]),
+        vault_path=_resolve(settings["vault_path"]),
+        emotion_log_file=_resolve(settings["emotion_log_file"]),
+        introspection_log_file=_resolve(settings["introspection_log_file"]),
+        decay_rate=float(settings["decay_rate"]),
+        fallback_emotion=settings["fallback_emotion"],
+        emotions=tuple(emotions),
+        emotion_index=MappingProxyType({emotion: i for i, emotion in enumerate(emotions)}),
+        initial_weights=MappingProxyType({emotion: float(schema.get("initial_weight", 0.5)) for emotion, schema in emotions.items()}),
+        lexicon=tuple((emotion, tuple(word.lower() for word in schema.get("keywords", []))) for emotion, schema in emotions.items() if schema.get("keywords")),
+        persona_tones=MappingProxyType({emotion: schema.get("tone", "") for emotion, schema in emotions.items()}),
+        reaction_table=_build_reaction_table(_resolve(settings["emotion_reactor_file"]), emotions),
+    )
+
+    # Directories are created by the components that write to them, not here:
+    # reload() and replay workers only need to read.
+    return snapshot
+
 
 class Config:
     _instance = None # Singleton instance
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(Config, cls).__new__(cls)
-            cls._instance._load_config()
+            instance = super(Config, cls).__new__(cls)
+            instance.snapshot = load_config()
+            cls._instance = instance
         return cls._instance
 
-    def _load_config(self):
-        config_path = os.path.join(os.path.dirname(__file__), 'config.json')
-        try:
-            with open(config_path, 'r') as f:
-                json_config = json.load(f)
-
-            self.DEFAULT_MODE = json_config.get("default_mode", "scratch")
-            self.VAULT_KEY_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), json_config.get("vault_key_path", "config/vault.key"))
-            self.EMOTION_LOG_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), json_config.get("emotion_log_file", "logs/ere_weight_log.jsonl"))
-
-            # Ensure directories exist
-            os.makedirs(os.path.dirname(self.VAULT_KEY_PATH), exist_ok=True)
-            os.makedirs(os.path.dirname(self.EMOTION_LOG_FILE), exist_ok=True)
-
-        except FileNotFoundError:
-            print(f"Error: config.json not found at {config_path}. Using default settings.")
-            self.DEFAULT_MODE = "scratch"
-            self.VAULT_KEY_PATH = os.path.join(os.getcwd(), "config", "vault.key")
-            self.EMOTION_LOG_FILE = os.path.join(os.getcwd(), "logs", "ere_weight_log.jsonl")
-
-        self.DEFAULT_DECAY_RATE = 0.05
-        self.INITIAL_PATHWAY_WEIGHTS = {
-            "joy": 0.5, "rage": 0.5, "calm": 0.5, "sacred": 0.5, "neutral": 1.0 # Updated emotions
-        }
-        # Add other configurable parameters here
+    def reload(self, config_path: str = CONFIG_PATH) -> ConfigSnapshot:
+        """
+        Re-reads config.json and swaps in the new snapshot in a single assignment.
+        If loading or validation fails the current snapshot stays in place.
+        Components built earlier keep the snapshot they were created with.
+        """
+        snapshot = load_config(config_path)
+        self.snapshot = snapshot
+        return snapshot
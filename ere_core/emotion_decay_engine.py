@@ -1,7 +1,12 @@
 class EmotionDecayEngine:
-    def __init__(self, decay_rate: float = 0.05):
+    def __init__(self, decay_rate: float = 0.05, verbose: bool = True):
+        """
+        :param decay_rate: Amount subtracted from every weight per decay step.
+        :param verbose: Announce the engine on construction. Headless callers pass False.
+        """
         self.decay_rate = decay_rate
-        print(f"EmotionDecayEngine initialized with decay rate: {self.decay_rate}")
+        if verbose:
+            print(f"EmotionDecayEngine initialized with decay rate: {self.decay_rate}")
 
     def apply_decay(self, weights: dict) -> dict:
         """
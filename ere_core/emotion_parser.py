@@ -1,14 +1,17 @@
 # presence_ai/ere_core/emotion_parser.py
 
-def detect_emotion(text: str) -> str:
-    """Very basic emotion detection stub."""
+from config.config import Config, ConfigSnapshot
+
+def detect_emotion(text: str, config: ConfigSnapshot = None) -> str:
+    """
+    Very basic keyword-based emotion detection.
+    Checks the precomputed lexicon in emotion-schema order; the first emotion
+    with a matching keyword wins, otherwise the fallback emotion is returned.
+    """
+    if config is None:
+        config = Config().snapshot
     text = text.lower()
-    if any(word in text for word in ["happy", "joy", "excited", "love"]):
-        return "joy"
-    elif any(word in text for word in ["angry", "mad", "hate", "furious"]):
-        return "rage"
-    elif any(word in text for word in ["calm", "peaceful", "relaxed"]):
-        return "calm"
-    elif any(word in text for word in ["sacred", "spiritual", "holy"]):
-        return "sacred"
-    return "neutral"
+    for emotion, keywords in config.lexicon:
+        if any(word in text for word in keywords):
+            return emotion
+    return config.fallback_emotion
@@ -4,46 +4,133 @@ from ere_core.soft_memory_map import SoftMemoryMap
 from ere_core.emotion_decay_engine import EmotionDecayEngine
 from ere_core.presence_persona import PresencePersona
 from ere_core.emotion_parser import detect_emotion as parse_emotion # Import the new parser
-from config.config import Config
+from ere_core.metrics import REGISTRY, timed
+from config.config import Config, ConfigSnapshot
 import random
 
 class EREEngine:
-    def __init__(self):
-        self.config = Config() # Get the singleton config instance
-        self.pathway_weights = self.config.INITIAL_PATHWAY_WEIGHTS.copy() # Use weights from config
-        self.soft_memory_map = SoftMemoryMap() # Will use EMOTION_LOG_FILE from config
-        self.decay_engine = EmotionDecayEngine(decay_rate=self.config.DEFAULT_DECAY_RATE)
-        self.presence_persona = PresencePersona() # Will use updated emotions in its persona_tones
+    _shared_components = {} # Stateless helpers reused across sessions: one per kind, replaced when stale
+
+    def __init__(self, config: ConfigSnapshot = None, weight_table=None, soft_memory_map: SoftMemoryMap = None,
+                 decay_engine: EmotionDecayEngine = None, presence_persona: PresencePersona = None):
+        """
+        :param config: Config snapshot for this session, e.g. from
+                       ConfigSnapshot.with_overrides(). Defaults to the current global one.
+        :param weight_table: Optional SessionWeightTable. When given, this engine's
+                             weights live in a shared-memory row so other processes
+                             can read (and decay) them.
+        :param soft_memory_map, decay_engine, presence_persona: Optional components to use.
+                             By default sessions share the log writer for their log file
+                             and the persona for the current tone table; the decay
+                             engine only holds a float, so each session builds its own.
+        """
+        self.config = config if config is not None else Config().snapshot
+        # Shared read-only weights; adjust_pathway_weights replaces them (copy-on-write).
+        self.pathway_weights = self.config.initial_weights
+        self.soft_memory_map = soft_memory_map if soft_memory_map is not None else SoftMemoryMap.shared(self.config)
+        self.decay_engine = decay_engine if decay_engine is not None else EmotionDecayEngine(decay_rate=self.config.decay_rate)
+        self.presence_persona = presence_persona if presence_persona is not None else self._shared(
+            "persona", lambda: PresencePersona(config=self.config),
+            valid=lambda persona: persona.persona_tones is self.config.persona_tones)
+        if weight_table is not None and tuple(weight_table.emotions) != self.config.emotions:
+            raise ValueError(
+                f"Weight table columns {tuple(weight_table.emotions)} do not match "
+                f"the config's emotion schema {self.config.emotions}."
+            )
+        self.weight_table = weight_table
+        self.session_slot = None
+        self._row_version = None # Row version we last wrote; a mismatch means another process changed it
+        if self.weight_table is not None:
+            self.session_slot = self.weight_table.allocate_slot(self.pathway_weights)
+            self._row_version = self.weight_table.row_version(self.session_slot)
+            print(f"EREEngine attached to shared weight table '{self.weight_table.name}', slot {self.session_slot}.")
         print("EREEngine initialized with default pathway weights.")
 
+    @classmethod
+    def _shared(cls, key, factory, valid=None):
+        """
+        Returns the cached component for `key`, building it with `factory` on first
+        use or when `valid` rejects the cached one (e.g. after a config reload).
+        Holding one component per key keeps the cache bounded.
+        """
+        component = cls._shared_components.get(key)
+        if component is None or (valid is not None and not valid(component)):
+            component = cls._shared_components[key] = factory()
+        return component
+
+    def release_session(self):
+        """Frees this engine's row in the shared weight table, if any."""
+        if self.weight_table is not None and self.session_slot is not None:
+            self.weight_table.release_slot(self.session_slot)
+            self.session_slot = None
+
+    @timed("ere_detect_emotion_seconds", "Latency of emotion detection.")
     def detect_emotion(self, text: str) -> str:
         """
         Detects emotion from user input using the emotion_parser.
         """
-        return parse_emotion(text)
+        emotion = parse_emotion(text, self.config)
+        if REGISTRY.enabled:
+            REGISTRY.counter("ere_emotions_detected_total", "Detected emotions.", {"emotion": emotion}).inc()
+        return emotion
 
+    @staticmethod
+    def compute_adjusted_weights(weights: dict, detected_emotion: str, intensity: float = 0.1) -> dict:
+        """
+        Pure weight-update rule behind adjust_pathway_weights: returns a new dict
+        without logging or printing.
+        """
+        adjusted = {}
+        for emotion, weight in weights.items():
+            if emotion == detected_emotion:
+                # Increase weight for the detected emotion
+                adjusted[emotion] = min(1.0, weight + intensity)
+            else:
+                # Slightly decay other weights to prevent stagnation (or let decay_engine handle it)
+                adjusted[emotion] = max(0.0, weight - (intensity / 5)) # Minor indirect decay
+        return adjusted
+
+    @timed("ere_adjust_pathway_weights_seconds", "Latency of pathway weight adjustment, including log I/O.")
     def adjust_pathway_weights(self, detected_emotion: str, intensity: float = 0.1):
         """
         Adjusts internal pathway weights based on detected emotion.
         This is the core of the "soft memory" learning.
         Weights reflect the AI's predisposition to respond in certain ways.
         """
-        if detected_emotion in self.pathway_weights:
-            # Increase weight for the detected emotion
-            self.pathway_weights[detected_emotion] = min(1.0, self.pathway_weights[detected_emotion] + intensity)
+        adjusted = None
+        if self.session_slot is None:
+            adjusted, self.pathway_weights = self.adjust_and_decay(self.pathway_weights, detected_emotion, intensity, self.decay_engine)
+        else:
+            def _update(version, row_weights):
+                nonlocal adjusted
+                # Keep our own exact weights unless another process (e.g. a
+                # supervisor decay pass) changed the shared row since our last write.
+                weights = self.pathway_weights if version == self._row_version else row_weights
+                adjusted, decayed = self.adjust_and_decay(weights, detected_emotion, intensity, self.decay_engine)
+                return decayed
 
-            # Slightly decay other weights to prevent stagnation (or let decay_engine handle it)
-            for emotion, weight in self.pathway_weights.items():
-                if emotion != detected_emotion:
-                    self.pathway_weights[emotion] = max(0.0, self.pathway_weights[emotion] - (intensity / 5)) # Minor indirect decay
+            # Read, adjust and write back under the table lock so no decay pass is lost.
+            self.pathway_weights, self._row_version = self.weight_table.update_weights(self.session_slot, _update)
 
-            self.soft_memory_map.log_weights(self.pathway_weights)
-            print(f"Pathway weights adjusted. Current: {self.pathway_weights}")
+        if adjusted is not None:
+            self.soft_memory_map.log_weights(adjusted)
+            print(f"Pathway weights adjusted. Current: {adjusted}")
 
-        # Apply general decay to all weights (simulates emotional "forgetting")
-        self.pathway_weights = self.decay_engine.apply_decay(self.pathway_weights)
+    @staticmethod
+    def adjust_and_decay(weights, detected_emotion: str, intensity: float, decay_engine: EmotionDecayEngine) -> tuple:
+        """
+        One turn of the weight rule: adjust for the detected emotion, then decay.
+        Pure, so the replay engine runs exactly the path live sessions run.
+        Returns (adjusted weights or None if the emotion is unknown, weights after decay).
+        """
+        adjusted = None
+        if detected_emotion in weights:
+            adjusted = weights = EREEngine.compute_adjusted_weights(weights, detected_emotion, intensity)
 
+        # Apply general decay to all weights (simulates emotional "forgetting")
+        return adjusted, decay_engine.apply_decay(weights)
 
+    @timed("ere_generate_response_seconds", "Latency of response generation.")
     def generate_response(self, user_input: str, current_emotion: str) -> str:
         """
         Generates an AI response influenced by the current pathway weights (soft memory).
@@ -5,30 +5,30 @@ import datetime
 import json
 import os
 from collections import deque
-from config.config import Config
+from config.config import Config, ConfigSnapshot
+from ere_core.metrics import REGISTRY, timed
 
 class LoopConsciousness:
-    def __init__(self, heartbeat_interval: float = 1.0, memory_capacity: int = 5):
+    def __init__(self, heartbeat_interval: float = 1.0, memory_capacity: int = 5, config: ConfigSnapshot = None):
         """
         Initializes the LoopConsciousness engine.
         :param heartbeat_interval: The simulated time interval for each 'tick' or 'pulse'.
         :param memory_capacity: How many recent states/events to keep in temporal memory.
+        :param config: Config snapshot. Defaults to the current global one.
         """
-        self.config = Config()
+        self.config = config if config is not None else Config().snapshot
         self.heartbeat_interval = heartbeat_interval
         self.memory_capacity = memory_capacity
         self.temporal_memory = deque(maxlen=self.memory_capacity)
         self.last_tick_time = time.monotonic()
         self.tick_count = 0
-        
-        # Determine introspection log path relative to the main log directory
-        logs_dir = os.path.dirname(self.config.EMOTION_LOG_FILE)
-        self.introspection_log_path = os.path.join(logs_dir, "consciousness_log.jsonl")
-        os.makedirs(logs_dir, exist_ok=True) # Ensure logs directory exists
+        self.introspection_log_path = self.config.introspection_log_file
+        os.makedirs(os.path.dirname(self.introspection_log_path), exist_ok=True) # Ensure logs directory exists
 
         print(f"LoopConsciousness initialized. Heartbeat: {heartbeat_interval}s, Memory Capacity: {memory_capacity}")
         print(f"Introspection logs will be written to: {self.introspection_log_path}")
 
+    @timed("loop_introspection_log_seconds", "Latency of introspection log writes.")
     def _log_introspection(self, data: dict):
         """Internal method to log introspection data."""
         log_entry = {
@@ -50,13 +50,14 @@ class LoopConsciousness:
         This would be a core part of its 'self-awareness' loop.
         """
         introspection_data = {
-            "current_ere_weights": current_ere_weights,
+            "current_ere_weights": dict(current_ere_weights),
             "last_detected_emotion": detected_emotion,
             "temporal_memory_snapshot": list(self.temporal_memory) # Convert deque to list for logging
         }
         self._log_introspection(introspection_data)
         # print(f"(Debug: Introspected at tick {self.tick_count})") # Uncomment for verbose debug
 
+    @timed("loop_pulse_seconds", "Latency of a consciousness loop pulse.")
     def pulse(self, current_ere_weights: dict, last_detected_emotion: str):
         """
         Represents a 'heartbeat' or 'tick' of the AI's consciousness loop.
@@ -70,10 +71,13 @@ class LoopConsciousness:
         # Always add to temporal memory with current state
         self.add_to_temporal_memory({
             "tick": self.tick_count,
-            "weights_snapshot": current_ere_weights,
+            "weights_snapshot": dict(current_ere_weights),
             "emotion": last_detected_emotion
         })
 
+        if REGISTRY.enabled:
+            REGISTRY.gauge("loop_tick_count", "Consciousness loop ticks so far.").set(self.tick_count)
+
         # Only introspect and reset timer if heartbeat interval has passed
         if time_elapsed >= self.heartbeat_interval:
             print(f"Consciousness Pulse: Tick {self.tick_count} (Time elapsed: {time_elapsed:.2f}s)")
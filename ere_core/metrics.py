@@ -0,0 +1,254 @@
+# presence_ai/ere_core/metrics.py
+
+import bisect
+import functools
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds (seconds) for latency histograms; +Inf is implicit.
+DEFAULT_LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class Counter:
+    """Monotonically increasing value."""
+    kind = "counter"
+
+    def __init__(self):
+        self._lock = threading.Lock() # Per metric, so unrelated metrics never contend
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def samples(self, name: str, labels: str):
+        yield f"{name}{labels}", self.value
+
+
+class Gauge:
+    """Value that can go up and down."""
+    kind = "gauge"
+
+    def __init__(self):
+        self._lock = threading.Lock() # Per metric, so unrelated metrics never contend
+        self.value = 0.0
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def samples(self, name: str, labels: str):
+        yield f"{name}{labels}", self.value
+
+
+class Histogram:
+    """Fixed-bucket histogram, typically of latencies in seconds."""
+    kind = "histogram"
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self._lock = threading.Lock() # Per metric, so unrelated metrics never contend
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1) # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def samples(self, name: str, labels: str):
+        # Prometheus buckets are cumulative; splice "le" into any existing labels.
+        prefix = labels[:-1] + "," if labels else "{"
+        with self._lock:
+            counts, total, count_all = list(self.counts), self.sum, self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            yield f'{name}_bucket{prefix}le="{le}"}}', cumulative
+        yield f"{name}_sum{labels}", total
+        yield f"{name}_count{labels}", count_all
+
+
+def _escape_label_value(value) -> str:
+    """Escapes a label value for the text exposition format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _escape_help(text: str) -> str:
+    """Escapes HELP text; unlike label values, quotes are left as they are."""
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+class _NullTimer:
+    """Shared no-op context manager returned while metrics are disabled."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._start)
+        return False
+
+
+class MetricsRegistry:
+    """
+    Process-wide registry of counters, gauges and histograms.
+
+    Disabled by default: instrumentation points check `enabled` first and do
+    nothing else, so an uninstrumented run pays one attribute lookup per call.
+    """
+    def __init__(self, namespace: str = "presence_ai"):
+        self.namespace = namespace
+        self.enabled = False
+        self._lock = threading.Lock() # Guards registration only; metrics have their own locks
+        self._metrics = {} # name -> (kind, help, {label string: metric})
+        self._server = None
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def _get(self, cls, name: str, help_text: str, labels: dict, **kwargs):
+        label_str = ""
+        if labels:
+            label_str = "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in sorted(labels.items())) + "}"
+        full_name = f"{self.namespace}_{name}"
+        family = self._metrics.get(full_name)
+        if family is None:
+            with self._lock:
+                family = self._metrics.setdefault(full_name, (cls.kind, help_text, {}))
+        if family[0] != cls.kind:
+            raise ValueError(f"Metric '{full_name}' is already registered as a {family[0]}, not a {cls.kind}.")
+        children = family[2]
+        metric = children.get(label_str)
+        if metric is None:
+            with self._lock:
+                metric = children.setdefault(label_str, cls(**kwargs))
+        return metric
+
+    def counter(self, name: str, help_text: str = "", labels: dict = None) -> Counter:
+        return self._get(Counter, name, help_text, labels)
+
+    def gauge(self, name: str, help_text: str = "", labels: dict = None) -> Gauge:
+        return self._get(Gauge, name, help_text, labels)
+
+    def histogram(self, name: str, help_text: str = "", labels: dict = None, buckets=DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help_text, labels, buckets=buckets)
+
+    def time(self, name: str, help_text: str = "", labels: dict = None):
+        """Context manager observing elapsed seconds into a histogram."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self.histogram(name, help_text, labels))
+
+    def collect(self) -> dict:
+        """Pull API: returns {sample name: value} for every registered metric."""
+        snapshot = {}
+        for name, (_, _, children) in list(self._metrics.items()):
+            for label_str, metric in list(children.items()):
+                for sample_name, value in metric.samples(name, label_str):
+                    snapshot[sample_name] = value
+        return snapshot
+
+    def render_prometheus(self) -> str:
+        """Renders all metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, (kind, help_text, children) in sorted(self._metrics.items()):
+            if help_text:
+                lines.append(f"# HELP {name} {_escape_help(help_text)}")
+            lines.append(f"# TYPE {name} {kind}")
+            for label_str, metric in list(children.items()):
+                for sample_name, value in metric.samples(name, label_str):
+                    lines.append(f"{sample_name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def start_http_server(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Serves /metrics in Prometheus text format from a daemon thread.
+        Also enables the registry, since an endpoint with no data is useless.
+        Raises RuntimeError if this registry is already serving; call
+        stop_http_server() first to move it.
+        """
+        registry = self
+
+        class _MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass # Keep scrapes out of the console
+
+        with self._lock:
+            if self._server is not None:
+                bound_host, bound_port = self._server.server_address[:2]
+                raise RuntimeError(f"Metrics endpoint already serving at http://{bound_host}:{bound_port}/metrics.")
+            self._server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        self.enable()
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        print(f"Metrics endpoint serving at http://{host}:{self._server.server_port}/metrics")
+        return self._server
+
+    def stop_http_server(self):
+        with self._lock:
+            server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+
+REGISTRY = MetricsRegistry() # Process-wide default registry
+
+
+def timed(name: str, help_text: str = ""):
+    """
+    Decorator recording a function's latency into REGISTRY histogram `name`.
+    When the registry is disabled the wrapped function is called directly.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not REGISTRY.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                REGISTRY.histogram(name, help_text).observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
@@ -1,15 +1,12 @@
 # presence_ai/ere_core/presence_persona.py
 
+from config.config import Config, ConfigSnapshot
+
 class PresencePersona:
-    def __init__(self):
-        # Define base tones or phrases associated with dominant emotions
-        self.persona_tones = {
-            "joy": " (with a light and uplifting tone)",
-            "rage": " (with a firm but calming tone)",
-            "calm": " (with a serene and steady tone)",
-            "sacred": " (with a reverent and profound tone)",
-            "neutral": " (with a balanced and observant tone)"
-        }
+    def __init__(self, config: ConfigSnapshot = None):
+        # Base tones or phrases associated with dominant emotions come from the emotion schema
+        config = config if config is not None else Config().snapshot
+        self.persona_tones = config.persona_tones
         print("PresencePersona initialized.")
 
     def get_persona_tone(self, dominant_emotion: str) -> str:
@@ -0,0 +1,180 @@
+# presence_ai/ere_core/replay_engine.py
+
+import datetime
+import itertools
+import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from config.config import Config, ConfigSnapshot
+from ere_core.emotion_decay_engine import EmotionDecayEngine
+from ere_core.emotion_parser import detect_emotion as parse_emotion
+from ere_core.ere_engine import EREEngine
+from virem_vault.vault_block_filter import VaultBlockFilter
+
+
+def load_corpus(corpus_path: str):
+    """
+    Streams (session_id, timestamp, text) records from a JSONL corpus.
+    Each line needs "session_id", "timestamp" and "text"; timestamps may be
+    unix seconds or ISO-8601 strings. Blank lines are skipped.
+    Raises ValueError if a record's timestamp is earlier than the one before it.
+    """
+    previous = None
+    with open(corpus_path, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            timestamp = record["timestamp"]
+            if isinstance(timestamp, str):
+                timestamp = datetime.datetime.fromisoformat(timestamp).timestamp()
+            timestamp = float(timestamp)
+            if previous is not None and timestamp < previous:
+                raise ValueError(
+                    f"{corpus_path}:{line_number}: timestamp {timestamp} is earlier than the "
+                    f"previous record's ({previous}); the corpus must be in timestamp order."
+                )
+            previous = timestamp
+            yield record["session_id"], timestamp, record["text"]
+
+
+def detect_turns(records, config: ConfigSnapshot = None):
+    """
+    Runs emotion detection over (session_id, timestamp, text) records and yields
+    (session_id, timestamp, detected emotion). Detection only depends on the
+    lexicon, so a sweep does this once and replays the result per configuration.
+    """
+    config = config if config is not None else Config().snapshot
+    for session_id, timestamp, text in records:
+        yield session_id, timestamp, parse_emotion(text, config)
+
+
+class ReplayEngine:
+    """
+    Headless replay of the detect -> adjust -> decay -> filter pipeline.
+
+    Runs the same rules as run_demo (EREEngine.adjust_and_decay and
+    VaultBlockFilter.is_soul_moment) over a recorded corpus, using the corpus
+    timestamps as simulated time. Nothing is printed, logged or stored; the
+    result is a summary dict.
+    """
+    def __init__(self, decay_rate: float = None, intensity: float = 0.1, thresholds: dict = None,
+                 session_timeout: float = None, initial_weights: dict = None, config: ConfigSnapshot = None):
+        """
+        :param decay_rate: Per-turn decay. Defaults to the config's decay_rate.
+        :param intensity: Adjustment intensity passed to the weight-update rule.
+        :param thresholds: VaultBlockFilter threshold overrides.
+        :param session_timeout: Simulated seconds of inactivity after which a session
+                                starts over from the initial weights. None disables it.
+        :param initial_weights: Per-emotion overrides of the config's initial weights.
+        :param config: Base config snapshot. Defaults to the current global one.
+        """
+        config = config if config is not None else Config().snapshot
+        overrides = {}
+        if decay_rate is not None:
+            overrides["decay_rate"] = decay_rate
+        if initial_weights is not None:
+            overrides["initial_weights"] = initial_weights
+        self.config = config.with_overrides(**overrides) if overrides else config
+        self.decay_rate = self.config.decay_rate
+        self.intensity = intensity
+        self.session_timeout = session_timeout
+        self.initial_weights = self.config.initial_weights
+        self.decay_engine = EmotionDecayEngine(decay_rate=self.decay_rate, verbose=False)
+        self.block_filter = VaultBlockFilter(thresholds, verbose=False)
+
+    def params(self) -> dict:
+        return {
+            "decay_rate": self.decay_rate,
+            "intensity": self.intensity,
+            "thresholds": self.block_filter.thresholds,
+            "session_timeout": self.session_timeout,
+        }
+
+    def run(self, records) -> dict:
+        """
+        Replays an iterable of (session_id, timestamp, text) records and returns
+        store rate, dominant/detected emotion distributions and session counts.
+        """
+        return self.run_detected(detect_turns(records, self.config))
+
+    def run_detected(self, turns) -> dict:
+        """Like run(), for (session_id, timestamp, detected emotion) turns from detect_turns()."""
+        session_weights = {}
+        last_seen = {}
+        detected_counts = Counter()
+        dominant_counts = Counter()
+        total = 0
+        stored = 0
+        sessions = 0
+
+        for session_id, timestamp, detected_emotion in turns:
+            weights = session_weights.get(session_id)
+            previous = last_seen.get(session_id)
+            if weights is None or (self.session_timeout is not None and timestamp - previous > self.session_timeout):
+                weights = self.initial_weights
+                sessions += 1
+            last_seen[session_id] = timestamp
+
+            _, weights = EREEngine.adjust_and_decay(weights, detected_emotion, self.intensity, self.decay_engine)
+            session_weights[session_id] = weights
+
+            dominant_emotion = max(weights, key=weights.get)
+            detected_counts[detected_emotion] += 1
+            dominant_counts[dominant_emotion] += 1
+            if self.block_filter.is_soul_moment(weights):
+                stored += 1
+            total += 1
+
+        return {
+            "params": self.params(),
+            "turns": total,
+            "sessions": sessions,
+            "stored_blocks": stored,
+            "store_rate": stored / total if total else 0.0,
+            "dominant_emotion_distribution": {e: c / total for e, c in dominant_counts.most_common()},
+            "detected_emotion_distribution": {e: c / total for e, c in detected_counts.most_common()},
+        }
+
+
+def parameter_grid(decay_rates, intensities, threshold_grid=None, session_timeout: float = None) -> list:
+    """
+    Expands the cartesian product of tuning values into ReplayEngine keyword dicts.
+    :param threshold_grid: Mapping of VaultBlockFilter threshold name -> list of values.
+    """
+    threshold_grid = threshold_grid or {}
+    names = list(threshold_grid)
+    grid = []
+    for decay_rate, intensity, *values in itertools.product(decay_rates, intensities, *threshold_grid.values()):
+        grid.append({
+            "decay_rate": decay_rate,
+            "intensity": intensity,
+            "thresholds": dict(zip(names, values)),
+            "session_timeout": session_timeout,
+        })
+    return grid
+
+
+_worker_turns = None # Detected corpus, handed to each pool worker once by _init_worker
+
+
+def _init_worker(turns: list):
+    global _worker_turns
+    _worker_turns = turns
+
+
+def _replay_turns(params: dict) -> dict:
+    """Process-pool entry point: replays the worker's detected corpus with one parameter set."""
+    return ReplayEngine(**params).run_detected(_worker_turns)
+
+
+def sweep(corpus_path: str, grid: list, workers: int = None) -> list:
+    """
+    Replays the corpus once per parameter set across a process pool.
+    The corpus is read and run through detection once, up front; workers only
+    run the adjust/decay/filter step. Returns the summaries in the same order as `grid`.
+    """
+    turns = list(detect_turns(load_corpus(corpus_path)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(turns,)) as pool:
+        return list(pool.map(_replay_turns, grid))
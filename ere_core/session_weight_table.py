@@ -0,0 +1,242 @@
+# presence_ai/ere_core/session_weight_table.py
+
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ere_core.metrics import timed
+
+_HEADER_DTYPE = np.dtype([("magic", "<u4"), ("capacity", "<u4"), ("num_emotions", "<u4"), ("reserved", "<u4")])
+_MAGIC = 0x45524557 # "EREW"
+
+
+class SessionWeightTable:
+    """
+    Shared-memory table of ERE pathway weights, one row per session.
+
+    Layout of the shared block (all fields 8-byte aligned):
+      header    : magic, capacity, number of emotions
+      versions  : uint64[capacity]   per-row seqlock counter (odd while a write is in progress)
+      occupied  : uint8[capacity]    slot allocator bitmap
+      weights   : float32[capacity, num_emotions]
+
+    One process creates the table; workers, supervisors and analytics processes
+    attach to it by name and get zero-copy NumPy views. Writers (and decay passes)
+    serialize through `lock`, which must be a multiprocessing.Lock shared with the
+    other processes if more than one of them writes. A table attached without one
+    is read-only: its writes raise RuntimeError, since a process-local lock would
+    not exclude the other writers. Readers never take the lock; they retry on the
+    row's version counter instead.
+
+    Weights are stored as float32. Values handed back to Python are rounded to
+    FLOAT32_DIGITS decimals so float32 noise (0.3799999952...) does not leak out.
+    """
+    FLOAT32_DIGITS = 6
+
+    def __init__(self, emotions, capacity: int = 1024, name: str = None, create: bool = True, lock=None):
+        """
+        :param emotions: Ordered emotion names; defines the column order of the matrix.
+        :param capacity: Maximum number of concurrent sessions (rows).
+        :param name: Shared memory block name. Generated when creating and omitted.
+        :param create: True to allocate a new block, False to attach to an existing one.
+        :param lock: multiprocessing.Lock shared by all writing processes. Optional
+                     for the creator; required to write through an attached table.
+        """
+        self.emotions = tuple(emotions)
+        self.emotion_index = {emotion: i for i, emotion in enumerate(self.emotions)}
+        self._lock = lock if lock is not None else threading.Lock()
+        self.read_only = not create and lock is None
+
+        if create:
+            size = self._layout(capacity, len(self.emotions))
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            self._map_views(capacity)
+            self._header["magic"] = _MAGIC
+            self._header["capacity"] = capacity
+            self._header["num_emotions"] = len(self.emotions)
+            self._versions[:] = 0
+            self._occupied[:] = 0
+            self._weights[:] = 0.0
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            header = np.ndarray((1,), dtype=_HEADER_DTYPE, buffer=self._shm.buf)[0]
+            # Copy the header out before any close(); touching the view afterwards would fault.
+            magic, capacity, num_emotions = int(header["magic"]), int(header["capacity"]), int(header["num_emotions"])
+            del header
+            if magic != _MAGIC:
+                self._shm.close()
+                raise ValueError(f"Shared memory block '{name}' is not a session weight table.")
+            if num_emotions != len(self.emotions):
+                self._shm.close()
+                raise ValueError(
+                    f"Emotion schema mismatch: table has {num_emotions} columns, "
+                    f"caller expects {len(self.emotions)}."
+                )
+            self._map_views(capacity)
+
+        self.name = self._shm.name
+        self.capacity = int(self._header["capacity"])
+
+    @classmethod
+    def attach(cls, name: str, emotions, lock=None) -> "SessionWeightTable":
+        """
+        Attaches to a table created by another process. Without `lock` (the
+        creator's multiprocessing.Lock) the attachment can only read.
+        """
+        return cls(emotions, name=name, create=False, lock=lock)
+
+    def _writer_lock(self):
+        """Returns the writer lock, refusing writes through a read-only attachment."""
+        if self.read_only:
+            raise RuntimeError(
+                f"SessionWeightTable '{self.name}' was attached without a shared lock and is read-only; "
+                "pass the creator's multiprocessing.Lock to attach() to write."
+            )
+        return self._lock
+
+    @staticmethod
+    def _align(offset: int) -> int:
+        return (offset + 7) & ~7
+
+    @classmethod
+    def _layout(cls, capacity: int, num_emotions: int) -> int:
+        """Returns the total block size for the given dimensions."""
+        size = _HEADER_DTYPE.itemsize
+        size += 8 * capacity
+        size = cls._align(size + capacity)
+        size += 4 * capacity * num_emotions
+        return size
+
+    def _map_views(self, capacity: int):
+        """Creates the NumPy views over the shared block."""
+        buf = self._shm.buf
+        offset = 0
+        self._header = np.ndarray((1,), dtype=_HEADER_DTYPE, buffer=buf, offset=offset)[0]
+        offset += _HEADER_DTYPE.itemsize
+        self._versions = np.ndarray((capacity,), dtype=np.uint64, buffer=buf, offset=offset)
+        offset += 8 * capacity
+        self._occupied = np.ndarray((capacity,), dtype=np.uint8, buffer=buf, offset=offset)
+        offset = self._align(offset + capacity)
+        self._weights = np.ndarray((capacity, len(self.emotions)), dtype=np.float32, buffer=buf, offset=offset)
+
+    def allocate_slot(self, initial_weights: dict = None) -> int:
+        """
+        Reserves a free row for a new session and returns its index.
+        Raises RuntimeError if the table is full.
+        """
+        with self._writer_lock():
+            free = np.flatnonzero(self._occupied == 0)
+            if free.size == 0:
+                raise RuntimeError(f"SessionWeightTable '{self.name}' is full ({self.capacity} sessions).")
+            slot = int(free[0])
+            self._occupied[slot] = 1
+            self._write_row(slot, initial_weights or {})
+        return slot
+
+    def release_slot(self, slot: int):
+        """Frees a session row so it can be reused."""
+        with self._writer_lock():
+            self._write_row(slot, {})
+            self._occupied[slot] = 0
+
+    def _write_row(self, slot: int, weights: dict) -> int:
+        """Seqlock-protected row write. Caller must hold the lock. Returns the new version."""
+        row = np.zeros(len(self.emotions), dtype=np.float32)
+        for emotion, weight in weights.items():
+            index = self.emotion_index.get(emotion)
+            if index is not None:
+                row[index] = weight
+        if self._versions[slot] & 1:
+            # A writer died mid-write (we hold the lock, so nobody else is writing).
+            # Close its version out; the row is fully overwritten below.
+            self._versions[slot] += 1
+        self._versions[slot] += 1 # Odd: write in progress
+        self._weights[slot] = row
+        self._versions[slot] += 1 # Even: row is consistent
+        return int(self._versions[slot])
+
+    def _row_to_dict(self, row: np.ndarray) -> dict:
+        return {emotion: round(float(row[i]), self.FLOAT32_DIGITS) for i, emotion in enumerate(self.emotions)}
+
+    def row_version(self, slot: int) -> int:
+        """Current seqlock version of a row; changes on every write or decay pass."""
+        return int(self._versions[slot])
+
+    def write_weights(self, slot: int, weights: dict) -> int:
+        """Publishes a session's current pathway weights to its row. Returns the new version."""
+        with self._writer_lock():
+            return self._write_row(slot, weights)
+
+    def update_weights(self, slot: int, update) -> tuple:
+        """
+        Atomic read-modify-write of one row.
+        `update(version, weights)` receives the row's current version and weights
+        and returns the new weights; it runs while the writer lock is held, so it
+        must be quick and must not call back into the table. No decay pass can
+        land between the read and the write.
+        :return: (new weights, new version)
+        """
+        with self._writer_lock():
+            version = int(self._versions[slot])
+            weights = update(version, self._row_to_dict(self._weights[slot]))
+            return weights, self._write_row(slot, weights)
+
+    def read_weights(self, slot: int, timeout: float = 0.05) -> dict:
+        """
+        Returns a consistent copy of a session's weights without taking the lock.
+        Retries, yielding the CPU, while a writer is updating the row.
+
+        Raises RuntimeError if the row stays mid-write for `timeout` seconds. That
+        normally means a writer died between its two version bumps; the row is
+        repaired by the next write_weights()/update_weights() on that slot.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            before = int(self._versions[slot])
+            if not before & 1:
+                row = self._weights[slot].copy()
+                if int(self._versions[slot]) == before:
+                    return self._row_to_dict(row)
+            if time.monotonic() >= deadline:
+                raise RuntimeError(
+                    f"Slot {slot} of '{self.name}' stayed mid-write for {timeout}s; "
+                    "a writer may have died. The next write to the slot repairs it."
+                )
+            time.sleep(0) # Yield to the writer
+
+    def weights_view(self) -> np.ndarray:
+        """
+        Zero-copy (capacity x emotions) float32 view of the whole matrix.
+        Rows may be mid-update; use read_weights() when a consistent row is needed.
+        """
+        return self._weights
+
+    def active_slots(self) -> np.ndarray:
+        """Indices of currently allocated rows."""
+        return np.flatnonzero(self._occupied)
+
+    @timed("session_table_decay_seconds", "Latency of shared-table decay passes.")
+    def apply_decay(self, decay_rate: float, floor: float = 0.1):
+        """
+        Decays every active session in one vectorized pass, mirroring
+        EmotionDecayEngine.apply_decay (weight - rate, clamped at `floor`).
+        """
+        with self._writer_lock():
+            active = self.active_slots()
+            if active.size == 0:
+                return
+            self._versions[active] |= np.uint64(1) # Odd: write in progress (also closes out rows left odd by a dead writer)
+            self._weights[active] = np.maximum(floor, self._weights[active] - decay_rate)
+            self._versions[active] += 1
+
+    def close(self):
+        """Detaches this process from the shared block."""
+        # Drop the views first; SharedMemory.close() refuses while buffers are exported.
+        self._header = self._versions = self._occupied = self._weights = None
+        self._shm.close()
+
+    def unlink(self):
+        """Destroys the shared block. Only the creating process should call this."""
+        self._shm.unlink()
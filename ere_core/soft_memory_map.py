@@ -1,22 +1,188 @@
+import bisect
+import fcntl
 import json
 import os
-from config.config import Config
+import threading
+import time
+from config.config import Config, ConfigSnapshot
+from ere_core.metrics import REGISTRY, timed
 
 class SoftMemoryMap:
-    def __init__(self):
-        self.log_file = Config().LOG_PATH
+    _shared_instances = {} # (log file, bucket_seconds, index_stride) -> SoftMemoryMap
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, config: ConfigSnapshot = None, bucket_seconds: int = 60, index_stride: int = 64) -> "SoftMemoryMap":
+        """
+        Returns the process-wide writer for the config's log file, creating it on
+        first use, so sessions do not each reload the index and rescan the log.
+        """
+        config = config if config is not None else Config().snapshot
+        key = (config.emotion_log_file, bucket_seconds, index_stride)
+        instance = cls._shared_instances.get(key)
+        if instance is None:
+            with cls._shared_lock:
+                instance = cls._shared_instances.get(key)
+                if instance is None:
+                    instance = cls._shared_instances[key] = cls(bucket_seconds, index_stride, config)
+        return instance
+
+    def __init__(self, bucket_seconds: int = 60, index_stride: int = 64, config: ConfigSnapshot = None):
+        """
+        :param bucket_seconds: Width of the coarse time bucket stamped on each record.
+                               Records only carry the bucket, never an exact time.
+        :param index_stride: Every Nth record gets an entry in the sparse side index.
+        :param config: Config snapshot. Defaults to the current global one.
+        """
+        config = config if config is not None else Config().snapshot
+        self.log_file = config.emotion_log_file
+        self.index_file = self.log_file + ".idx" # Lines of "<seq> <bucket> <byte offset>"
+        self.bucket_seconds = bucket_seconds
+        self.index_stride = index_stride
         os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
+
+        self._index_buckets = []
+        self._index_offsets = []
+        self._index_end = 0 # Bytes of the index file already loaded
+        self._log_end = 0 # Bytes of the log already reflected in _next_seq/_last_bucket
+        self._next_seq = 0
+        self._last_bucket = 0
+        # Several instances (and processes) may share one log file. Appends take an
+        # exclusive flock on it and re-sync from the file first; this lock guards
+        # this instance's in-memory state between threads.
+        self._state_lock = threading.Lock()
+        with self._state_lock:
+            self._catch_up()
         print(f"SoftMemoryMap logging to: {self.log_file}")
 
+    @timed("soft_memory_catch_up_seconds", "Latency of index and log tail scans (start-up, before appends and queries).")
+    def _catch_up(self):
+        """
+        Brings the in-memory index, next sequence number and last bucket up to date
+        with whatever has been appended to the index and log files since the last
+        call, by this or any other writer. Caller must hold _state_lock.
+        """
+        try:
+            with open(self.index_file, 'rb') as f:
+                f.seek(self._index_end)
+                data = f.read()
+        except FileNotFoundError:
+            data = b''
+        complete = data[:data.rfind(b'\n') + 1] # Ignore a partially written last entry
+        self._index_end += len(complete)
+        for line in complete.splitlines():
+            parts = line.split()
+            try:
+                seq, bucket, offset = (int(p) for p in parts)
+            except ValueError:
+                continue # Malformed entry (wrong field count or a non-number); the log scan covers it
+            self._index_buckets.append(bucket)
+            self._index_offsets.append(offset)
+            self._next_seq = max(self._next_seq, seq + 1)
+            self._last_bucket = max(self._last_bucket, bucket)
+
+        # Everything before the last indexed record is already accounted for.
+        if self._index_offsets and self._index_offsets[-1] > self._log_end:
+            self._log_end = self._index_offsets[-1]
+        for _, end, entry in self._scan(self._log_end):
+            if "seq" in entry:
+                self._next_seq = max(self._next_seq, entry["seq"] + 1)
+                self._last_bucket = max(self._last_bucket, entry["bucket"])
+            self._log_end = end
+
+    def _scan(self, offset: int):
+        """Yields (start offset, end offset, entry) for every complete log record from `offset` on."""
+        try:
+            with open(self.log_file, 'rb') as f:
+                f.seek(offset)
+                while True:
+                    line = f.readline()
+                    if not line.endswith(b'\n'):
+                        return # EOF or a record still being written
+                    end = offset + len(line)
+                    try:
+                        yield offset, end, json.loads(line)
+                    except json.JSONDecodeError:
+                        pass
+                    offset = end
+        except FileNotFoundError:
+            return
+
+    def _current_bucket(self) -> int:
+        # Never step backwards, so buckets stay sorted even if the wall clock does.
+        return max(int(time.time() // self.bucket_seconds), self._last_bucket)
+
+    @timed("soft_memory_log_weights_seconds", "Latency of weight log appends.")
     def log_weights(self, weights: dict):
         """Logs the current state of pathway weights to a file."""
-        log_entry = {
-            "timestamp": os.urandom(8).hex(), # Use a non-time-based ID for privacy/statelessness, or just remove if not needed for specific tracking
-            "weights": weights
-        }
-        with open(self.log_file, 'a') as f:
-            f.write(json.dumps(log_entry) + '\n')
+        with self._state_lock, open(self.log_file, 'ab') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                # Another instance or process may have appended since our last write.
+                self._catch_up()
+                seq = self._next_seq
+                bucket = self._current_bucket()
+                log_entry = {
+                    "seq": seq, # Monotonic ordering key
+                    "bucket": bucket, # Coarse time bucket (unix time // bucket_seconds), not an exact timestamp
+                    "weights": weights
+                }
+                record = (json.dumps(log_entry) + '\n').encode('utf-8')
+                offset = f.seek(0, os.SEEK_END) # Where this record really lands, read under the lock
+                f.write(record)
+                f.flush()
+
+                if seq % self.index_stride == 0:
+                    entry = f"{seq} {bucket} {offset}\n".encode('utf-8')
+                    with open(self.index_file, 'ab') as index:
+                        index_offset = index.seek(0, os.SEEK_END)
+                        index.write(entry)
+                    self._index_buckets.append(bucket)
+                    self._index_offsets.append(offset)
+                    self._index_end = index_offset + len(entry)
+                # We were caught up and still hold the flock, so the record just
+                # written is the only change; account for it without rereading.
+                self._next_seq = seq + 1
+                self._last_bucket = bucket
+                self._log_end = offset + len(record)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def query(self, start: float, end: float = None):
+        """
+        Streams logged entries whose time bucket falls within [start, end].
+        :param start: Unix time of the range start.
+        :param end: Unix time of the range end. Defaults to open-ended.
+        Uses the sparse index to seek near the first matching record instead of
+        reading the whole log. Records written before sequencing was added are skipped.
+        The recorded latency covers only the seek (catch-up and index lookup), not
+        the stream, whose pace is set by the consumer.
+        """
+        start_bucket = int(start // self.bucket_seconds)
+        end_bucket = int(end // self.bucket_seconds) if end is not None else None
+
+        with REGISTRY.time("soft_memory_query_seek_seconds", "Latency of weight log range query seeks."):
+            with self._state_lock:
+                self._catch_up()
+                # Last index point strictly before start_bucket; records after it may already match.
+                i = bisect.bisect_left(self._index_buckets, start_bucket) - 1
+                offset = self._index_offsets[i] if i >= 0 else 0
+
+        streamed = 0
+        try:
+            for _, _, entry in self._scan(offset):
+                bucket = entry.get("bucket")
+                if bucket is None or bucket < start_bucket:
+                    continue
+                if end_bucket is not None and bucket > end_bucket:
+                    return
+                streamed += 1
+                yield entry
+        finally:
+            if REGISTRY.enabled:
+                REGISTRY.counter("soft_memory_query_records_total", "Weight log records streamed by range queries.").inc(streamed)
 
+    @timed("soft_memory_bias_trends_seconds", "Latency of full weight log scans.")
     def get_bias_trends(self):
         """
         Analyzes the log file to understand long-term emotional bias trends.
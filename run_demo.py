@@ -14,6 +14,7 @@ from virem_vault.scratchpad import ScratchpadVault
 from ere_core.loop_consciousness import LoopConsciousness
 from ere_core.reaction_mapper import ReactionMapper
 from virem_vault.vault_block_filter import VaultBlockFilter
+from ere_core.metrics import REGISTRY
 
 # --- Conceptual Session Lifetime & RAM Teardown ---
 # This path simulates a temporary RAM-only storage area that is cleaned on exit.
@@ -38,20 +39,29 @@ atexit.register(teardown_ram_scratch)
 
 def main():
     # Load configuration settings (from config/config.json)
-    app_config = Config()
+    app_config = Config().snapshot
 
     parser = argparse.ArgumentParser(description="Run Stateless AI with Affective Soft Memory.")
     parser.add_argument(
         "--mode",
         type=str,
-        default=app_config.DEFAULT_MODE, # Default mode loaded from config.json
+        default=app_config.default_mode, # Default mode loaded from config.json
         choices=["scratch", "persistent"],
-        help=f"Operating mode: 'scratch' (RAM-only, zero-trace) or 'persistent' (ChaCha20 encrypted file-based, privacy-preserving). Default: {app_config.DEFAULT_MODE}"
+        help=f"Operating mode: 'scratch' (RAM-only, zero-trace) or 'persistent' (ChaCha20 encrypted file-based, privacy-preserving). Default: {app_config.default_mode}"
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Enable pipeline metrics and serve them in Prometheus text format on this local port (e.g. 9108). Disabled by default."
     )
     args = parser.parse_args()
 
     print(f"--- Starting Stateless AI Demo in {args.mode.upper()} Mode ---")
 
+    if args.metrics_port is not None:
+        REGISTRY.start_http_server(args.metrics_port)
+
     # If in 'scratch' mode, initialize the conceptual RAM scratchpad
     if args.mode == "scratch":
         initialize_ram_scratch()
@@ -68,8 +78,8 @@ def main():
         print("VIREM Vault: Operating in RAM-only Scratchpad mode.")
     else: # persistent mode
         # The vault_path is now derived from config.json -> config.py
-        virem_vault = VIREMVaultDriver(vault_path=app_config.VAULT_PATH)
-        print(f"VIREM Vault: Operating in persistent encrypted mode. Vault path: {app_config.VAULT_PATH}.")
+        virem_vault = VIREMVaultDriver(vault_path=app_config.vault_path)
+        print(f"VIREM Vault: Operating in persistent encrypted mode. Vault path: {app_config.vault_path}.")
 
     # 3. Emotive Resonance Engine (ERE) Initialization
     ere_engine = EREEngine()
@@ -0,0 +1,44 @@
+# presence_ai/run_replay.py
+
+import argparse
+import json
+
+from ere_core.replay_engine import parameter_grid, sweep
+
+
+def _floats(value: str) -> list:
+    return [float(v) for v in value.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded corpus through the ERE pipeline and sweep tuning parameters.")
+    parser.add_argument("--corpus", required=True, help="JSONL file of {session_id, timestamp, text} records, in timestamp order.")
+    parser.add_argument("--decay-rates", type=_floats, default=[0.05], help="Comma-separated decay rates to try. Default: 0.05")
+    parser.add_argument("--intensities", type=_floats, default=[0.1], help="Comma-separated adjustment intensities to try. Default: 0.1")
+    parser.add_argument("--combined-thresholds", type=_floats, default=None, help="Comma-separated sacred+joy combined thresholds to try.")
+    parser.add_argument("--min-individual-weights", type=_floats, default=None, help="Comma-separated per-emotion soul-moment minimums to try.")
+    parser.add_argument("--session-timeout", type=float, default=None, help="Simulated idle seconds after which a session restarts from initial weights.")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size. Default: CPU count.")
+    parser.add_argument("--output", type=str, default=None, help="Write one JSON summary per configuration to this file instead of stdout.")
+    args = parser.parse_args()
+
+    threshold_grid = {}
+    if args.combined_thresholds:
+        threshold_grid["sacred_joy_combined_threshold"] = args.combined_thresholds
+    if args.min_individual_weights:
+        threshold_grid["min_individual_weight_for_soul_moment"] = args.min_individual_weights
+
+    grid = parameter_grid(args.decay_rates, args.intensities, threshold_grid, args.session_timeout)
+    summaries = sweep(args.corpus, grid, workers=args.workers)
+
+    lines = [json.dumps(summary) for summary in summaries]
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"Wrote {len(lines)} replay summaries to {args.output}")
+    else:
+        print("\n".join(lines))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+import dataclasses
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import load_config
+
+
+@pytest.fixture
+def tmp_config(tmp_path):
+    """Config snapshot whose log files live under tmp_path."""
+    return dataclasses.replace(
+        load_config(),
+        emotion_log_file=str(tmp_path / "logs" / "ere_weight_log.jsonl"),
+        introspection_log_file=str(tmp_path / "logs" / "consciousness_log.jsonl"),
+    )
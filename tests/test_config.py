@@ -0,0 +1,117 @@
+import dataclasses
+import json
+
+import pytest
+
+from config.config import CONFIG_PATH, Config, load_config
+from ere_core.ere_engine import EREEngine
+
+with open(CONFIG_PATH) as f:
+    EMOTIONS = json.load(f)["emotions"]
+
+
+def _write(tmp_path, settings):
+    """Writes a config.json; dict settings get the repo's emotion schema unless they set their own."""
+    path = tmp_path / "config.json"
+    if isinstance(settings, dict):
+        settings = json.dumps({"emotions": EMOTIONS, **settings})
+    path.write_text(settings)
+    return str(path)
+
+
+@pytest.mark.parametrize("settings", [
+    "[1, 2]",
+    "{bad",
+    {"emotions": ["joy", "rage"]},
+    {"emotions": {}},
+    {"emotions": {"neutral": "calm"}},
+    {"emotions": {"neutral": {"initial_weight": "high"}}},
+    {"emotions": {"neutral": {"keywords": "ok"}}},
+    {"emotions": {"neutral": {"keywords": [1]}}},
+    {"decay_rate": "fast"},
+    {"decay_rate": 2},
+    {"default_mode": "cloud"},
+    {"fallback_emotion": "sadness"},
+    {"vault_path": 3},
+    {"decay_rte": 0.1},
+])
+def test_invalid_settings_raise_value_error(tmp_path, settings):
+    with pytest.raises(ValueError):
+        load_config(_write(tmp_path, settings))
+
+
+def test_emotion_schema_comes_only_from_config_json(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"decay_rate": 0.1}))
+    with pytest.raises(ValueError):
+        load_config(str(path))
+
+    # Without any config.json the defaults fall back to a neutral-only schema.
+    config = load_config(str(tmp_path / "missing.json"))
+    assert config.emotions == ("neutral",)
+    assert config.fallback_emotion == "neutral"
+
+
+def test_snapshot_precomputes_schema_structures():
+    config = load_config()
+    assert config.emotions == ("joy", "rage", "calm", "sacred", "neutral")
+    assert config.emotion_index["sacred"] == 3
+    assert config.lexicon[0] == ("joy", ("happy", "joy", "excited", "love"))
+    assert config.reaction_table["calm"]["visual"] == "😌"
+    with pytest.raises(TypeError):
+        config.initial_weights["joy"] = 1.0
+
+
+def test_load_config_creates_no_directories(tmp_path):
+    load_config(_write(tmp_path, {"emotion_log_file": str(tmp_path / "new" / "log.jsonl")}))
+    assert not (tmp_path / "new").exists()
+
+
+def test_with_overrides_shares_unchanged_fields_and_validates():
+    config = load_config()
+    session = config.with_overrides(decay_rate=0.1, initial_weights={"joy": 0.9})
+    assert session.initial_weights["joy"] == 0.9
+    assert session.initial_weights["rage"] == config.initial_weights["rage"]
+    assert session.lexicon is config.lexicon
+    assert session.reaction_table is config.reaction_table
+    with pytest.raises(ValueError):
+        config.with_overrides(decay_rate=-1)
+    with pytest.raises(ValueError):
+        config.with_overrides(vault_path="elsewhere")
+
+
+def test_reload_swaps_snapshot_and_keeps_old_one_on_failure(tmp_path):
+    holder = Config()
+    original = holder.snapshot
+    try:
+        reloaded = holder.reload(_write(tmp_path, {"decay_rate": 0.2}))
+        assert holder.snapshot is reloaded and reloaded.decay_rate == 0.2
+        with pytest.raises(ValueError):
+            holder.reload(_write(tmp_path, {"decay_rate": "x"}))
+        assert holder.snapshot is reloaded
+    finally:
+        holder.snapshot = original
+
+
+def test_sessions_share_components_and_weights(tmp_config):
+    first = EREEngine(config=tmp_config)
+    second = EREEngine(config=tmp_config)
+    assert first.soft_memory_map is second.soft_memory_map
+    assert first.presence_persona is second.presence_persona
+    assert first.pathway_weights is tmp_config.initial_weights
+
+    faster = EREEngine(config=tmp_config.with_overrides(decay_rate=0.2))
+    assert faster.decay_engine.decay_rate == 0.2 and first.decay_engine.decay_rate == 0.05
+    assert faster.soft_memory_map is first.soft_memory_map
+    assert faster.presence_persona is first.presence_persona
+
+    first.adjust_pathway_weights("joy")
+    assert second.pathway_weights is tmp_config.initial_weights # Copy-on-write
+
+
+def test_shared_component_cache_stays_bounded_across_reloads(tmp_config):
+    for rate in (0.1, 0.2, 0.3):
+        reloaded = dataclasses.replace(load_config(), emotion_log_file=tmp_config.emotion_log_file)
+        engine = EREEngine(config=reloaded.with_overrides(decay_rate=rate))
+        assert engine.presence_persona.persona_tones is reloaded.persona_tones
+    assert len(EREEngine._shared_components) == 1
@@ -0,0 +1,80 @@
+import time
+
+import pytest
+
+import ere_core.metrics as metrics
+import ere_core.soft_memory_map as soft_memory_map
+from ere_core.metrics import MetricsRegistry
+from ere_core.soft_memory_map import SoftMemoryMap
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics, "REGISTRY", registry)
+    return registry
+
+
+def test_disabled_registry_records_nothing(registry):
+    with registry.time("stage_seconds"):
+        pass
+    assert registry.collect() == {}
+
+
+def test_name_reused_with_another_kind_raises(registry):
+    registry.counter("events_total").inc()
+    with pytest.raises(ValueError):
+        registry.histogram("events_total")
+    assert registry.counter("events_total") is registry.counter("events_total")
+
+
+def test_prometheus_rendering_of_labelled_histogram(registry):
+    histogram = registry.histogram("stage_seconds", "Stage latency.", {"stage": "detect"}, buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    text = registry.render_prometheus()
+    assert "# TYPE presence_ai_stage_seconds histogram" in text
+    assert 'presence_ai_stage_seconds_bucket{stage="detect",le="0.1"} 1' in text
+    assert 'presence_ai_stage_seconds_bucket{stage="detect",le="+Inf"} 2' in text
+    assert 'presence_ai_stage_seconds_count{stage="detect"} 2' in text
+
+
+def test_label_values_and_help_text_are_escaped(registry):
+    registry.counter("events_total", "Line one\\two\nthree", {"text": 'say "hi"\\\n'}).inc()
+    text = registry.render_prometheus()
+    assert "# HELP presence_ai_events_total Line one\\\\two\\nthree\n" in text
+    assert 'presence_ai_events_total{text="say \\"hi\\"\\\\\\n"} 1.0' in text
+
+
+def test_second_http_server_raises_until_stopped(registry):
+    server = registry.start_http_server(0)
+    try:
+        with pytest.raises(RuntimeError):
+            registry.start_http_server(0)
+        assert registry._server is server
+    finally:
+        registry.stop_http_server()
+    registry.start_http_server(0)
+    registry.stop_http_server()
+
+
+def test_soft_memory_query_is_timed_and_counted(monkeypatch, tmp_config):
+    registry = MetricsRegistry()
+    registry.enable()
+    monkeypatch.setattr(metrics, "REGISTRY", registry)
+    monkeypatch.setattr(soft_memory_map, "REGISTRY", registry)
+
+    memory_map = SoftMemoryMap(config=tmp_config)
+    for i in range(3):
+        memory_map.log_weights({"joy": i})
+    streamed = 0
+    for _ in memory_map.query(0):
+        time.sleep(0.05) # A slow consumer must not show up as query latency
+        streamed += 1
+    assert streamed == 3
+
+    samples = registry.collect()
+    assert samples["presence_ai_soft_memory_query_records_total"] == 3
+    assert samples["presence_ai_soft_memory_query_seek_seconds_count"] == 1
+    assert samples["presence_ai_soft_memory_query_seek_seconds_sum"] < 0.05
+    assert samples["presence_ai_soft_memory_catch_up_seconds_count"] >= 1
@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from ere_core.ere_engine import EREEngine
+from ere_core.replay_engine import ReplayEngine, load_corpus, parameter_grid, sweep
+from virem_vault.vault_block_filter import VaultBlockFilter
+
+TEXTS = ["so happy", "holy and sacred", "I love this", "angry", "furious", "calm", "so happy", "spiritual", "hello"]
+
+
+def _write_corpus(path, records):
+    with open(path, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+    return str(path)
+
+
+def test_load_corpus_accepts_unix_and_iso_timestamps_and_skips_blank_lines(tmp_path):
+    path = tmp_path / "corpus.jsonl"
+    path.write_text(
+        json.dumps({"session_id": "a", "timestamp": 1704067200, "text": "so happy"}) + "\n"
+        "\n"
+        "   \n"
+        + json.dumps({"session_id": "b", "timestamp": "2024-01-01T00:00:10+00:00", "text": "calm"}) + "\n"
+    )
+    assert list(load_corpus(str(path))) == [("a", 1704067200.0, "so happy"), ("b", 1704067210.0, "calm")]
+
+
+def test_load_corpus_rejects_out_of_order_records(tmp_path):
+    path = _write_corpus(tmp_path / "corpus.jsonl", [
+        {"session_id": "a", "timestamp": 10, "text": "so happy"},
+        {"session_id": "a", "timestamp": 10, "text": "calm"},
+        {"session_id": "b", "timestamp": 5, "text": "angry"},
+    ])
+    records = load_corpus(path)
+    assert next(records)[1] == next(records)[1] == 10.0
+    with pytest.raises(ValueError):
+        next(records)
+
+
+def test_replay_matches_a_live_engine(tmp_config):
+    engine = EREEngine(config=tmp_config)
+    block_filter = VaultBlockFilter()
+    stored = 0
+    dominant = []
+    for text in TEXTS:
+        engine.adjust_pathway_weights(engine.detect_emotion(text))
+        stored += block_filter.should_store_block(engine.pathway_weights)
+        dominant.append(max(engine.pathway_weights, key=engine.pathway_weights.get))
+    assert 0 < stored < len(TEXTS)
+
+    summary = ReplayEngine(config=tmp_config).run(("s", float(t), text) for t, text in enumerate(TEXTS))
+    assert summary["turns"] == len(TEXTS)
+    assert summary["sessions"] == 1
+    assert summary["stored_blocks"] == stored
+    assert summary["dominant_emotion_distribution"] == {e: dominant.count(e) / len(TEXTS) for e in set(dominant)}
+
+
+def test_session_timeout_restarts_from_initial_weights(tmp_config):
+    replay = ReplayEngine(session_timeout=100, config=tmp_config)
+    resumed = replay.run([("a", 0.0, "so happy"), ("a", 1000.0, "holy")])
+    fresh = ReplayEngine(config=tmp_config).run([("a", 0.0, "so happy"), ("b", 1000.0, "holy")])
+    assert resumed["sessions"] == fresh["sessions"] == 2
+    del resumed["params"], fresh["params"]
+    assert resumed == fresh
+
+    # Within the timeout the session carries on.
+    assert replay.run([("a", 0.0, "so happy"), ("a", 50.0, "holy")])["sessions"] == 1
+
+
+def test_parameter_grid_is_the_full_cartesian_product():
+    grid = parameter_grid([0.01, 0.05], [0.1, 0.2, 0.3],
+                          {"sacred_joy_combined_threshold": [0.6, 0.7], "min_individual_weight_for_soul_moment": [0.3, 0.4]},
+                          session_timeout=60)
+    assert len(grid) == 2 * 3 * 2 * 2
+    combos = {(p["decay_rate"], p["intensity"], p["thresholds"]["sacred_joy_combined_threshold"],
+               p["thresholds"]["min_individual_weight_for_soul_moment"]) for p in grid}
+    assert len(combos) == len(grid)
+    assert all(p["session_timeout"] == 60 for p in grid)
+    assert parameter_grid([0.05], [0.1]) == [{"decay_rate": 0.05, "intensity": 0.1, "thresholds": {}, "session_timeout": None}]
+
+
+def test_sweep_returns_summaries_in_grid_order(tmp_path):
+    path = _write_corpus(tmp_path / "corpus.jsonl", [
+        {"session_id": f"s{i % 3}", "timestamp": i, "text": text} for i, text in enumerate(TEXTS * 3)
+    ])
+    grid = parameter_grid([0.2, 0.01, 0.1], [0.1, 0.3])
+    summaries = sweep(path, grid, workers=2)
+
+    assert [s["params"]["decay_rate"] for s in summaries] == [p["decay_rate"] for p in grid]
+    assert [s["params"]["intensity"] for s in summaries] == [p["intensity"] for p in grid]
+    assert summaries == [ReplayEngine(**params).run(load_corpus(path)) for params in grid]
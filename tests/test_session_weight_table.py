@@ -0,0 +1,136 @@
+import multiprocessing
+
+import pytest
+
+from ere_core.ere_engine import EREEngine
+from ere_core.session_weight_table import SessionWeightTable
+
+EMOTIONS = ("joy", "rage", "calm", "sacred", "neutral")
+
+
+@pytest.fixture
+def table():
+    table = SessionWeightTable(EMOTIONS, capacity=3, lock=multiprocessing.Lock())
+    yield table
+    table.close()
+    table.unlink()
+
+
+def test_allocate_until_full_and_reuse_released_slot(table):
+    slots = [table.allocate_slot() for _ in range(3)]
+    assert slots == [0, 1, 2]
+    with pytest.raises(RuntimeError):
+        table.allocate_slot()
+
+    table.release_slot(1)
+    assert list(table.active_slots()) == [0, 2]
+    assert table.allocate_slot({"joy": 0.5}) == 1
+    assert table.read_weights(1)["joy"] == 0.5
+
+
+def test_write_bumps_version_by_two_and_reads_are_rounded(table):
+    slot = table.allocate_slot()
+    before = table.row_version(slot)
+    assert table.write_weights(slot, {"joy": 0.38, "neutral": 1.0}) == before + 2
+    weights = table.read_weights(slot)
+    assert weights["joy"] == 0.38 # Not 0.3799999952316284
+    assert weights["rage"] == 0.0
+
+
+def test_stuck_odd_row_times_out_and_next_write_repairs_it(table):
+    slot = table.allocate_slot({"joy": 0.5})
+    table._versions[slot] += 1 # Simulate a writer dying mid-write
+    with pytest.raises(RuntimeError):
+        table.read_weights(slot, timeout=0.01)
+
+    version = table.write_weights(slot, {"joy": 0.7})
+    assert version % 2 == 0
+    assert table.read_weights(slot)["joy"] == 0.7
+
+
+def test_decay_pass_closes_out_stuck_rows(table):
+    slot = table.allocate_slot({"joy": 0.5})
+    table._versions[slot] += 1
+    table.apply_decay(0.1)
+    assert table.row_version(slot) % 2 == 0
+    assert table.read_weights(slot)["joy"] == 0.4
+
+
+def test_update_weights_sees_and_keeps_decay(table):
+    slot = table.allocate_slot({"joy": 0.5})
+    table.apply_decay(0.1)
+    seen = []
+
+    def update(version, weights):
+        seen.append(weights["joy"])
+        return dict(weights, joy=weights["joy"] + 0.2)
+
+    weights, version = table.update_weights(slot, update)
+    assert seen == [0.4]
+    assert weights["joy"] == pytest.approx(0.6)
+    assert version == table.row_version(slot)
+
+
+def _writer(name, slot, lock):
+    table = SessionWeightTable.attach(name, EMOTIONS, lock=lock)
+    table.write_weights(slot, {"calm": 0.25})
+    table.close()
+
+
+def test_attach_from_another_process_and_schema_check(table):
+    slot = table.allocate_slot()
+    process = multiprocessing.Process(target=_writer, args=(table.name, slot, table._lock))
+    process.start()
+    process.join(10)
+    assert process.exitcode == 0
+    assert table.read_weights(slot)["calm"] == 0.25
+
+    with pytest.raises(ValueError):
+        SessionWeightTable.attach(table.name, EMOTIONS[:2])
+
+
+def test_attach_without_lock_is_read_only(table):
+    slot = table.allocate_slot({"joy": 0.5})
+    reader = SessionWeightTable.attach(table.name, EMOTIONS)
+    try:
+        assert reader.read_weights(slot)["joy"] == 0.5
+        for write in (lambda: reader.write_weights(slot, {"joy": 0.7}),
+                      lambda: reader.update_weights(slot, lambda version, weights: weights),
+                      lambda: reader.apply_decay(0.1),
+                      lambda: reader.allocate_slot()):
+            with pytest.raises(RuntimeError):
+                write()
+        assert table.read_weights(slot)["joy"] == 0.5
+    finally:
+        reader.close()
+
+
+def test_engine_keeps_exact_weights_and_adopts_external_decay(table, tmp_config):
+    engine = EREEngine(config=tmp_config, weight_table=table)
+    plain = EREEngine(config=tmp_config)
+
+    for text in ["so happy", "holy"]:
+        for e in (engine, plain):
+            e.adjust_pathway_weights(e.detect_emotion(text))
+    # Without outside interference the table changes nothing about the engine's state.
+    assert engine.pathway_weights == plain.pathway_weights
+
+    table.apply_decay(0.05)
+    expected = table.read_weights(engine.session_slot)
+    engine.adjust_pathway_weights("neutral")
+    assert engine.pathway_weights["joy"] == pytest.approx(max(0.1, expected["joy"] - 0.02 - 0.05))
+    assert all(len(repr(w)) < 12 for w in engine.pathway_weights.values()) # No float32 noise
+
+    engine.release_session()
+    assert engine.session_slot is None
+
+
+def test_engine_rejects_table_with_other_emotion_schema(tmp_config):
+    table = SessionWeightTable(tuple(reversed(EMOTIONS)), capacity=1)
+    try:
+        with pytest.raises(ValueError):
+            EREEngine(config=tmp_config, weight_table=table)
+        assert list(table.active_slots()) == []
+    finally:
+        table.close()
+        table.unlink()
@@ -0,0 +1,120 @@
+import json
+import multiprocessing
+import os
+
+import pytest
+
+import ere_core.soft_memory_map as soft_memory_map
+from ere_core.soft_memory_map import SoftMemoryMap
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(soft_memory_map.time, "time", lambda: now[0])
+    return now
+
+
+def _records(log_file):
+    with open(log_file) as f:
+        return [json.loads(line) for line in f]
+
+
+def _index(index_file):
+    with open(index_file) as f:
+        return [tuple(int(p) for p in line.split()) for line in f]
+
+
+def _assert_index_points_at_records(memory_map):
+    with open(memory_map.log_file, 'rb') as f:
+        data = f.read()
+    for seq, bucket, offset in _index(memory_map.index_file):
+        assert offset == 0 or data[offset - 1:offset] == b'\n'
+        entry = json.loads(data[offset:data.index(b'\n', offset)])
+        assert (entry["seq"], entry["bucket"]) == (seq, bucket)
+
+
+def test_instances_sharing_a_log_keep_one_sequence(tmp_config, clock):
+    first = SoftMemoryMap(index_stride=2, config=tmp_config)
+    second = SoftMemoryMap(index_stride=2, config=tmp_config)
+    for i in range(3):
+        first.log_weights({"joy": i})
+        second.log_weights({"joy": i})
+
+    assert [r["seq"] for r in _records(first.log_file)] == list(range(6))
+    assert [entry[0] for entry in _index(first.index_file)] == [0, 2, 4]
+    _assert_index_points_at_records(first)
+
+
+def _write_many(config, count):
+    memory_map = SoftMemoryMap(index_stride=4, config=config)
+    for i in range(count):
+        memory_map.log_weights({"joy": i})
+
+
+def test_processes_sharing_a_log_keep_one_sequence(tmp_config):
+    processes = [multiprocessing.Process(target=_write_many, args=(tmp_config, 50)) for _ in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+        assert process.exitcode == 0
+
+    memory_map = SoftMemoryMap(index_stride=4, config=tmp_config)
+    assert [r["seq"] for r in _records(memory_map.log_file)] == list(range(150))
+    assert [entry[0] for entry in _index(memory_map.index_file)] == list(range(0, 150, 4))
+    _assert_index_points_at_records(memory_map)
+
+
+def test_query_streams_only_the_requested_range(tmp_config, clock):
+    memory_map = SoftMemoryMap(bucket_seconds=10, index_stride=4, config=tmp_config)
+    for i in range(50):
+        memory_map.log_weights({"joy": i})
+        clock[0] += 3 # Record i is written at 1000 + 3i
+
+    # Buckets 106..108 cover 1060..1089, i.e. records 20..29.
+    assert [e["seq"] for e in memory_map.query(1060, 1089)] == list(range(20, 30))
+    # A start inside the first indexed bucket, and open-ended ranges.
+    assert [e["seq"] for e in memory_map.query(1000, 1009)] == [0, 1, 2, 3]
+    assert [e["seq"] for e in memory_map.query(1140)] == [47, 48, 49]
+    assert list(memory_map.query(2000)) == []
+
+
+def test_query_skips_legacy_records_and_restart_continues_sequence(tmp_config, clock):
+    os.makedirs(os.path.dirname(tmp_config.emotion_log_file))
+    with open(tmp_config.emotion_log_file, 'w') as f:
+        f.write(json.dumps({"timestamp": "ab12", "weights": {"joy": 0.5}}) + '\n')
+
+    memory_map = SoftMemoryMap(index_stride=2, config=tmp_config)
+    for i in range(3):
+        memory_map.log_weights({"joy": i})
+    restarted = SoftMemoryMap(index_stride=2, config=tmp_config)
+    restarted.log_weights({"joy": 3})
+
+    assert [e["seq"] for e in restarted.query(0)] == [0, 1, 2, 3]
+    assert len(restarted.get_bias_trends()["joy"]) == 5
+    _assert_index_points_at_records(restarted)
+
+
+def test_append_state_matches_a_fresh_catch_up(tmp_config, clock):
+    memory_map = SoftMemoryMap(bucket_seconds=10, index_stride=3, config=tmp_config)
+    for i in range(10):
+        memory_map.log_weights({"joy": i})
+        clock[0] += 7
+
+    fresh = SoftMemoryMap(bucket_seconds=10, index_stride=3, config=tmp_config)
+    for attr in ("_index_buckets", "_index_offsets", "_index_end", "_log_end", "_next_seq", "_last_bucket"):
+        assert getattr(memory_map, attr) == getattr(fresh, attr), attr
+
+
+def test_malformed_index_lines_are_skipped(tmp_config, clock):
+    memory_map = SoftMemoryMap(index_stride=2, config=tmp_config)
+    for i in range(3):
+        memory_map.log_weights({"joy": i})
+    with open(memory_map.index_file, 'a') as f:
+        f.write("x 16 0\n7 8\n")
+
+    restarted = SoftMemoryMap(index_stride=2, config=tmp_config)
+    assert restarted._index_offsets == memory_map._index_offsets
+    restarted.log_weights({"joy": 3})
+    assert [e["seq"] for e in restarted.query(0)] == [0, 1, 2, 3]
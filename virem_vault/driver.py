@@ -2,6 +2,7 @@ from cryptography.fernet import Fernet
 import os
 import json
 from virem_vault.key_derivation import derive_ephemeral_key
+from ere_core.metrics import timed
 
 class VIREMVaultDriver:
     """
@@ -25,6 +26,7 @@ class VIREMVaultDriver:
             raise ValueError("Ephemeral key not set. Call set_ephemeral_key first.")
         return Fernet(self.ephemeral_key)
 
+    @timed("vault_store_block_seconds", "Latency of encrypted vault block writes.")
     def store_block(self, block_id: str, data: str):
         """
         Stores an encrypted data block.
@@ -46,6 +48,7 @@ class VIREMVaultDriver:
             vault_file.write(b'--BLOCK_END--\n')
         print(f"Block '{block_id}' encrypted and stored.")
 
+    @timed("vault_retrieve_block_seconds", "Latency of encrypted vault block reads.")
     def retrieve_block(self, block_id: str) -> str | None:
         """
         Retrieves and decrypts a specific data block.
@@ -80,6 +83,7 @@ class VIREMVaultDriver:
         print(f"Block '{block_id}' not found.")
         return None
 
+    @timed("vault_clear_seconds", "Latency of vault file removal.")
     def clear_vault(self):
         """
         Clears the persistent vault file. This would be part of a
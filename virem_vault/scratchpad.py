@@ -1,3 +1,5 @@
+from ere_core.metrics import timed
+
 class ScratchpadVault:
     """
     RAM-only memory vault for true stateless operation.
@@ -7,11 +9,13 @@ class ScratchpadVault:
         self._memory_store = {} # In-memory dictionary
         print("ScratchpadVault initialized (RAM-only).")
 
+    @timed("scratchpad_store_block_seconds", "Latency of RAM scratchpad writes.")
     def store_block(self, block_id: str, data: str):
         """Stores a data block temporarily in RAM."""
         self._memory_store[block_id] = data
         print(f"Block '{block_id}' stored in RAM scratchpad.")
 
+    @timed("scratchpad_retrieve_block_seconds", "Latency of RAM scratchpad reads.")
     def retrieve_block(self, block_id: str) -> str | None:
         """Retrieves a data block from RAM."""
         return self._memory_store.get(block_id)
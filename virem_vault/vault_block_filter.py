@@ -1,13 +1,15 @@
 # presence_ai/virem_vault/vault_block_filter.py
 
 from typing import Dict, Any
+from ere_core.metrics import REGISTRY, timed
 
 class VaultBlockFilter:
-    def __init__(self, config_thresholds: Dict[str, Any] = None):
+    def __init__(self, config_thresholds: Dict[str, Any] = None, verbose: bool = True):
         """
         Initializes the VaultBlockFilter with emotional thresholds for storage.
         These thresholds determine when a memory block is deemed 'significant' enough to persist.
         :param config_thresholds: Optional dictionary of specific thresholds to override defaults.
+        :param verbose: Print the thresholds on construction. Headless callers pass False.
         """
         # Define filtering rules/thresholds. These can be made configurable via config.json later.
         # Example rule: a "soul moment" is when both 'sacred' and 'joy' are above certain weights.
@@ -20,9 +22,25 @@ class VaultBlockFilter:
         if config_thresholds:
             self.thresholds.update(config_thresholds) # Allow overriding via constructor if desired
 
-        print("VaultBlockFilter initialized with emotional thresholds.")
-        print(f"Current thresholds: {self.thresholds}")
+        if verbose:
+            print("VaultBlockFilter initialized with emotional thresholds.")
+            print(f"Current thresholds: {self.thresholds}")
 
+    def is_soul_moment(self, ere_pathway_weights: Dict[str, float]) -> bool:
+        """
+        Pure threshold check behind should_store_block, with no output.
+        Requires both 'sacred' and 'joy' to individually meet a minimum,
+        AND their combined sum to meet a higher threshold.
+        """
+        sacred_weight = ere_pathway_weights.get("sacred", 0.0)
+        joy_weight = ere_pathway_weights.get("joy", 0.0)
+        return (
+            sacred_weight >= self.thresholds["min_individual_weight_for_soul_moment"] and
+            joy_weight >= self.thresholds["min_individual_weight_for_soul_moment"] and
+            (sacred_weight + joy_weight) >= self.thresholds["sacred_joy_combined_threshold"]
+        )
+
+    @timed("vault_filter_should_store_seconds", "Latency of vault block filter decisions.")
     def should_store_block(self, ere_pathway_weights: Dict[str, float]) -> bool:
         """
         Determines if a memory block should be stored in the persistent vault
@@ -36,13 +54,10 @@ class VaultBlockFilter:
         joy_weight = ere_pathway_weights.get("joy", 0.0)
 
         # Condition 1: Check for a "soul moment"
-        # Requires both 'sacred' and 'joy' to individually meet a minimum,
-        # AND their combined sum to meet a higher threshold.
-        is_soul_moment = (
-            sacred_weight >= self.thresholds["min_individual_weight_for_soul_moment"] and
-            joy_weight >= self.thresholds["min_individual_weight_for_soul_moment"] and
-            (sacred_weight + joy_weight) >= self.thresholds["sacred_joy_combined_threshold"]
-        )
+        is_soul_moment = self.is_soul_moment(ere_pathway_weights)
+
+        if REGISTRY.enabled:
+            REGISTRY.counter("vault_filter_decisions_total", "Vault block filter decisions.", {"stored": str(is_soul_moment).lower()}).inc()
 
         if is_soul_moment:
             print(f"VaultBlockFilter: 'Soul Moment' detected! (Sacred: {sacred_weight:.2f}, Joy: {joy_weight:.2f}). Block will be stored.")